@@ -1,12 +1,152 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import sys
+import threading
+import warnings
+import zlib
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import List
+
+import aiolimiter
+import diskcache
+import httpx
+import requests
 from pytube import YouTube
 from youtube_transcript_api import YouTubeTranscriptApi
 import openai
+import tiktoken
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+# Context window (tokens) per chat model; unknown models fall back to DEFAULT_CONTEXT
+MODEL_CONTEXT = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-3.5-turbo-16k": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+DEFAULT_CONTEXT = 4096
+PROMPT_OVERHEAD = 500          # tokens reserved for the system message + prompt scaffolding
+MAX_COMPLETION_TOKENS = 800    # tokens reserved for the model's answer
+TARGET_SUMMARY_TOKENS = 600    # completion tokens shared out across the chunk summaries
+MIN_CHUNK_SUMMARY_TOKENS = 120 # floor for any single chunk summary (room for a few bullets)
+TOKENS_PER_BULLET = 40         # rough size of one timestamped bullet point
+MERGE_FAN_IN = 8               # most partial summaries merged per reduce call (less if the context is small)
+WINDOW_SECONDS = 20            # consecutive caption cues are coalesced into windows of this length
+
+# Matches the 11-character video ID in watch, youtu.be, embed, shorts and live URLs
+_VID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/embed/|/shorts/|/live/)([A-Za-z0-9_-]{11})")
+
+# One HTTP session per thread for transcript requests, so repeated fetches reuse TCP/TLS
+# connections. requests.Session isn't thread-safe (its cookie jar is written while fetching),
+# and summarize_videos fetches from several executor threads at once.
+_thread_local = threading.local()
+
+
+def _transcript_api():
+    api = getattr(_thread_local, "transcript_api", None)
+    if api is None:
+        api = _thread_local.transcript_api = YouTubeTranscriptApi(http_client=requests.Session())
+    return api
+
+# Tokenizers are expensive to build, so load each one once per process
+_ENC = functools.lru_cache(maxsize=4)(tiktoken.encoding_for_model)
+
+# Prompt templates for the chunked (map-reduce) summarizer
+_CHUNK_SYS = "You summarize YouTube subtitles with timestamps."
+_CHUNK_USER_TMPL = (
+    "You are a professional summarizer for YouTube videos. Below is a chunk of subtitles with timestamps. "
+    "Summarize the key points for this chunk while preserving the timestamps you see.\n\n"
+    "{chunk}\n\n"
+    "Output at most {max_bullets} concise bullet points, retaining timestamps where present."
+)
+_MERGE_SYS = "You merge multiple partial summaries into one coherent outline, keeping useful timestamps."
+_MERGE_USER_TMPL = (
+    "Merge the following partial summaries into one concise list of key events (10–15 bullets). "
+    "If multiple timestamps refer to the same idea, keep the earliest. Keep timestamps where present.\n\n"
+    "{partials}"
+)
+
+# On-disk cache for transcripts (by video ID) and summaries (by transcript, settings and prompts)
+_cache = diskcache.Cache(os.path.expanduser(os.getenv("CCORE_CACHE_DIR", "~/.cache/ai-videosummarizer")))
+
+
+@functools.lru_cache(maxsize=None)
+def _sync_client(openai_api_key: str):
+    # One client (and connection pool) per API key for the blocking single-shot path
+    return openai.OpenAI(api_key=openai_api_key)
+
+
+def _async_client(openai_api_key: str):
+    """
+    Builds an AsyncOpenAI client backed by a pooled HTTP/2 connection. It is bound to the
+    running event loop, so each asyncio.run() builds (and closes) its own.
+    """
+    return openai.AsyncOpenAI(
+        api_key=openai_api_key,
+        max_retries=0,  # retries are handled by _open_stream
+        http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=64), http2=True),
+    )
+
+
+@contextlib.asynccontextmanager
+async def _client_scope(openai_api_key, client=None):
+    # Use the caller's client (without its SDK retries, which would stack under _open_stream's
+    # and back off while holding a concurrency and rate-limiter slot); otherwise own one for the run
+    if client is not None:
+        yield client.with_options(max_retries=0)
+        return
+    async with _async_client(openai_api_key) as owned:
+        yield owned
+
+
+def _cache_key(*parts):
+    return hashlib.blake2b(json.dumps(parts).encode()).hexdigest()
+
+
+# Editing any prompt template invalidates the cached summaries
+_PROMPT_HASH = _cache_key(_CHUNK_SYS, _CHUNK_USER_TMPL, _MERGE_SYS, _MERGE_USER_TMPL)
+
+
+@dataclass
+class Transcript:
+    """
+    Caption cues stored column-wise: start/end times (seconds) as compact float arrays
+    and the caption texts as a list, all indexed by cue.
+    """
+    __slots__ = ("starts", "ends", "texts")
+    starts: array
+    ends: array
+    texts: List[str]
+
+    def __len__(self):
+        return len(self.texts)
+
+    def to_dict(self):
+        return {"starts": self.starts.tolist(), "ends": self.ends.tolist(), "texts": self.texts}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(array("d", d["starts"]), array("d", d["ends"]), d["texts"])
 
 
 def get_video_id(video_url):
     """
-    Retrieves the video ID using pytube.
+    Extracts the video ID from the URL, falling back to pytube for formats the regex doesn't cover.
     """
+    m = _VID_RE.search(video_url)
+    if m:
+        return m.group(1)
     try:
         yt = YouTube(video_url)
         return yt.video_id
@@ -18,57 +158,103 @@ def fetch_transcript_with_timestamps(video_url):
     """
     Fetches subtitles with timestamps from a YouTube video, including auto-generated ones.
     :param video_url: URL of the YouTube video
-    :return: List of subtitles with timestamps or an error message
+    :return: Transcript of the subtitles with timestamps or an error message
     """
     try:
-        # Get the video ID using pytube
+        # Get the video ID from the URL
         video_id = get_video_id(video_url)
 
+        # Reuse a previously fetched transcript if there is one
+        key = _cache_key("transcript", 2, video_id)
+        cached = _cache.get(key)
+        if cached is not None:
+            return Transcript.from_dict(json.loads(zlib.decompress(cached)))
+
         # Fetch the transcript (tries human-made first, then auto-generated 'a.en')
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['en', 'a.en'])
-
-        # Format the transcript with timestamps
-        formatted_transcript = []
-        for entry in transcript:
-            start_time = entry['start']          # start time (seconds)
-            duration = entry['duration']         # duration (seconds)
-            text = entry['text']                 # caption text
-            formatted_transcript.append({
-                "start_time": start_time,
-                "end_time": start_time + duration,
-                "text": text
-            })
+        transcript = _transcript_api().fetch(video_id, languages=['en', 'a.en'])
+
+        # Store the transcript column-wise, in whole seconds: timestamps are only shown
+        # to the second, and integral values hit format_timestamp's cache
+        snippets = transcript.snippets
+        formatted_transcript = Transcript(
+            starts=array("d", (int(sn.start) for sn in snippets)),
+            ends=array("d", (int(sn.start + sn.duration) for sn in snippets)),
+            texts=[sn.text for sn in snippets],
+        )
 
+        _cache.set(key, zlib.compress(json.dumps(formatted_transcript.to_dict()).encode()))
         return formatted_transcript
     except Exception as e:
         return f"Error: {e}"
 
 
+def merge_transcript_entries(transcript, window_seconds=WINDOW_SECONDS):
+    """
+    Coalesces consecutive caption cues into windows of roughly `window_seconds`,
+    so the prompt carries one timestamp prefix per window instead of per cue.
+    :param transcript: Transcript of caption cues.
+    :return: Transcript of merged windows.
+    """
+    # A single linear pass: cue durations often overlap, so `ends` is not sorted and can't be bisected
+    starts, ends, texts = array("d"), array("d"), []
+    window_start = window_end = None
+    window_texts = []
+    for start, end, text in zip(transcript.starts, transcript.ends, transcript.texts):
+        if window_texts and end - window_start >= window_seconds:
+            starts.append(window_start)
+            ends.append(window_end)
+            texts.append(" ".join(window_texts))
+            window_texts = []
+        if not window_texts:
+            window_start, window_end = start, end
+        # Cues overlap, so the window ends with whichever of its cues ends last
+        window_end = max(window_end, end)
+        window_texts.append(text)
+    if window_texts:
+        starts.append(window_start)
+        ends.append(window_end)
+        texts.append(" ".join(window_texts))
+    return Transcript(starts, ends, texts)
+
+
+@functools.lru_cache(maxsize=4096)
 def format_timestamp(seconds):
     """
     Converts seconds into a human-readable timestamp (hh:mm:ss).
+    Cached, since merged windows and adjacent cues repeat the same second many times.
+    """
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return "%02d:%02d:%02d" % (hours, minutes, seconds)
+
+
+def _format_line(start, end, text):
+    return "[%s - %s] %s" % (format_timestamp(start), format_timestamp(end), text)
+
+
+def format_subtitles(transcript):
+    """
+    Renders the transcript as one "[hh:mm:ss - hh:mm:ss] text" line per cue.
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = int(seconds % 60)
-    return f"{hours:02}:{minutes:02}:{seconds:02}"
+    return "\n".join(map(_format_line, transcript.starts, transcript.ends, transcript.texts))
 
 
-def summarize_with_chatgpt(transcript, openai_api_key, model="gpt-3.5-turbo"):
+def summarize_with_chatgpt(
+    transcript, openai_api_key, model="gpt-3.5-turbo", window_seconds=WINDOW_SECONDS, client=None
+):
     """
-    (Original single-shot summarizer — kept intact)
-    Summarizes the transcript using ChatGPT while preserving timestamps.
-    :param transcript: List of dicts with "start_time", "end_time", and "text".
+    Single-shot summarizer: merges caption cues into windows and summarizes the whole
+    transcript with one ChatGPT request (capped at MAX_COMPLETION_TOKENS), preserving timestamps.
+    :param transcript: Transcript of caption cues.
     :param openai_api_key: OpenAI API key.
     :param model: Chat model (default: gpt-3.5-turbo).
+    :param window_seconds: Length of the windows caption cues are merged into.
+    :param client: Optional openai.OpenAI client to use instead of one built from the key.
     :return: Summarized text or an error message.
     """
     try:
         # Combine subtitles into a single formatted string
-        subtitles = "\n".join(
-            f"[{format_timestamp(entry['start_time'])} - {format_timestamp(entry['end_time'])}] {entry['text']}"
-            for entry in transcript
-        )
+        subtitles = format_subtitles(merge_transcript_entries(transcript, window_seconds))
 
         # Define prompt
         prompt = (
@@ -79,97 +265,365 @@ def summarize_with_chatgpt(transcript, openai_api_key, model="gpt-3.5-turbo"):
         )
 
         # Call ChatGPT
-        openai.api_key = openai_api_key
-        response = openai.ChatCompletion.create(
+        client = client or _sync_client(openai_api_key)
+        response = client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": "You summarize YouTube subtitles with timestamps."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.2
+            temperature=0.2,
+            max_tokens=MAX_COMPLETION_TOKENS
         )
 
         return response.choices[0].message.content
     except Exception as e:
         return f"Error during summarization: {e}"
 
-def chunk_text_by_chars(text: str, max_chars: int = 6000):
-    if len(text) <= max_chars:
-        return [text]
-    chunks, cur, cur_len = [], [], 0
-    for line in text.splitlines():
-        L = len(line) + 1
-        if cur_len + L > max_chars and cur:
-            chunks.append("\n".join(cur))
-            cur, cur_len = [], 0
-        cur.append(line)
-        cur_len += L
-    if cur:
-        chunks.append("\n".join(cur))
-    return chunks
-
-
-def summarize_chunk_with_chatgpt(subtitles_chunk: str, openai_api_key: str, model: str):
-    openai.api_key = openai_api_key
-
-    system_msg = "You summarize YouTube subtitles with timestamps."
-    user_prompt = (
-        "You are a professional summarizer for YouTube videos. Below is a chunk of subtitles with timestamps. "
-        "Summarize the key points for this chunk while preserving the timestamps you see.\n\n"
-        f"{subtitles_chunk}\n\n"
-        "Output 5–10 concise bullet points, retaining timestamps where present."
-    )
+def chunk_budget(model: str) -> int:
+    """
+    Number of subtitle tokens that fit in one chunk prompt for `model`.
+    """
+    return MODEL_CONTEXT.get(model, DEFAULT_CONTEXT) - PROMPT_OVERHEAD - MAX_COMPLETION_TOKENS
+
+
+def chunk_transcript(transcript, model: str, max_tokens: int = None, overlap: int = 200):
+    """
+    Formats the transcript line by line and groups the lines into chunks of at most
+    `max_tokens` tokens (as counted by the model's tokenizer), consecutive chunks
+    sharing up to `overlap` tokens of trailing lines as context. A line longer than
+    `max_tokens` on its own is split into token slices.
+    :return: Generator of (chunk_text, n_tokens) pairs.
+    """
+    if max_tokens is None:
+        max_tokens = chunk_budget(model)
+    if max_tokens < 2:
+        raise ValueError("max_tokens must be at least 2")
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be non-negative and smaller than max_tokens")
+
+    enc = _ENC(model)
+
+    def pieces():
+        # (text, n_tokens) per line, +1 token for the joining newline; oversize lines are sliced
+        for line in map(_format_line, transcript.starts, transcript.ends, transcript.texts):
+            ids = enc.encode(line)
+            if len(ids) < max_tokens:
+                yield line, len(ids) + 1
+                continue
+            for i in range(0, len(ids), max_tokens - 1):
+                piece = ids[i:i + max_tokens - 1]
+                yield enc.decode(piece), len(piece) + 1
+
+    lines, sizes, size = deque(), deque(), 0
+    pending = False  # whether `lines` holds anything not yet emitted
+    for line, n in pieces():
+        if pending and size + n > max_tokens:
+            yield "\n".join(lines), size
+            pending = False
+            # Keep only the trailing lines that fit in the overlap and leave room for this one
+            while lines and (size > overlap or size + n > max_tokens):
+                lines.popleft()
+                size -= sizes.popleft()
+        lines.append(line)
+        sizes.append(n)
+        size += n
+        pending = True
+    if pending:
+        yield "\n".join(lines), size
+
+
+def chunk_summary_budget(chunk_tokens: int, total_tokens: int, target: int = TARGET_SUMMARY_TOKENS) -> int:
+    """
+    Completion-token budget for one chunk summary, proportional to the chunk's share
+    of the transcript: max(MIN_CHUNK_SUMMARY_TOKENS, target * |chunk| / |transcript|).
+    """
+    return max(MIN_CHUNK_SUMMARY_TOKENS, int(target * chunk_tokens / max(total_tokens, 1)))
+
+
+def _rate_limiter():
+    # Token bucket sized to the account's requests-per-minute limit (CCORE_OPENAI_RPM, default 500)
+    return aiolimiter.AsyncLimiter(int(os.getenv("CCORE_OPENAI_RPM", 500)), 60)
+
+
+@retry(
+    # Transient failures: 429s, connection errors and timeouts, and 5xx responses
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)),
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+async def _open_stream(client, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, **kwargs):
+    # Every attempt, retries included, takes a concurrency slot and a rate-limiter slot.
+    # A failed attempt gives its concurrency slot back, so backoff sleeps don't hold it;
+    # on success the caller releases it once the stream is consumed.
+    await sem.acquire()
+    try:
+        async with limiter:
+            return await client.chat.completions.create(stream=True, **kwargs)
+    except BaseException:
+        sem.release()
+        raise
 
-    resp = openai.ChatCompletion.create(
+
+async def _stream_completion(
+    client, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, model: str, messages,
+    max_tokens: int = MAX_COMPLETION_TOKENS
+):
+    """
+    Yields the completion's content deltas as they arrive.
+    """
+    resp = await _open_stream(
+        client,
+        sem,
+        limiter,
         model=model,
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_prompt}
-        ],
+        messages=messages,
         temperature=0.2,
+        max_tokens=max_tokens,
     )
-    return resp.choices[0].message.content.strip()
+    try:
+        async for event in resp:
+            if not event.choices:
+                continue
+            choice = event.choices[0]
+            if choice.delta.content:
+                yield choice.delta.content
+            if choice.finish_reason == "length":
+                warnings.warn(f"Completion was cut off at max_tokens={max_tokens}; the summary may be incomplete")
+    finally:
+        sem.release()
 
 
-def summarize_with_chatgpt_chunked(transcript, openai_api_key, model="gpt-3.5-turbo", max_chars=7000):
-    try:
-        # 1) Format subtitles (timestamped)
-        formatted = "\n".join(
-            f"[{format_timestamp(e['start_time'])} - {format_timestamp(e['end_time'])}] {e['text']}"
-            for e in transcript
-        )
+async def _collect(deltas):
+    buf = io.StringIO()
+    async for delta in deltas:
+        buf.write(delta)
+    return buf.getvalue().strip()
+
+
+async def _complete(
+    client, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, model: str, messages,
+    max_tokens: int = MAX_COMPLETION_TOKENS
+):
+    return await _collect(_stream_completion(client, sem, limiter, model, messages, max_tokens=max_tokens))
+
+
+def _merge_messages(partials):
+    return [
+        {"role": "system", "content": _MERGE_SYS},
+        {"role": "user", "content": _MERGE_USER_TMPL.format(partials="\n\n---\n\n".join(partials))}
+    ]
+
+
+def _chunk_messages(subtitles_chunk: str, max_tokens: int):
+    # Ask for only as many bullets as the completion budget can hold, so answers aren't cut off
+    max_bullets = max(1, min(10, max_tokens // TOKENS_PER_BULLET))
+    return [
+        {"role": "system", "content": _CHUNK_SYS},
+        {"role": "user", "content": _CHUNK_USER_TMPL.format(chunk=subtitles_chunk, max_bullets=max_bullets)}
+    ]
+
+
+async def summarize_chunk_with_chatgpt(
+    client: openai.AsyncOpenAI, subtitles_chunk: str, model: str, sem: asyncio.Semaphore,
+    limiter: aiolimiter.AsyncLimiter, max_tokens: int = MAX_COMPLETION_TOKENS
+):
+    return await _complete(client, sem, limiter, model, _chunk_messages(subtitles_chunk, max_tokens), max_tokens=max_tokens)
+
+
+async def _summarize_chunk_async(
+    subtitles_chunk: str, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, client: openai.AsyncOpenAI,
+    model: str, max_tokens: int
+):
+    # Chunk summaries are cached individually, so a run that fails part-way resumes where it stopped
+    key = _cache_key("partial", subtitles_chunk, model, max_tokens, _PROMPT_HASH)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
 
-        # 2) Chunk by size
-        chunks = chunk_text_by_chars(formatted, max_chars=max_chars)
-
-        # 3) Map: summarize each chunk
-        partial_summaries = [
-            summarize_chunk_with_chatgpt(ch, openai_api_key=openai_api_key, model=model)
-            for ch in chunks
-        ]
-
-        # 4) Reduce: merge partials into a single concise outline
-        openai.api_key = openai_api_key
-        system_msg = "You merge multiple partial summaries into one coherent outline, keeping useful timestamps."
-        user_prompt = (
-            "Merge the following partial summaries into one concise list of key events (10–15 bullets). "
-            "If multiple timestamps refer to the same idea, keep the earliest. Keep timestamps where present.\n\n"
-            + "\n\n---\n\n".join(partial_summaries)
+    summary = await summarize_chunk_with_chatgpt(
+        client, subtitles_chunk, model=model, sem=sem, limiter=limiter, max_tokens=max_tokens
+    )
+    _cache.set(key, summary)
+    return summary
+
+
+async def _merge_partials_async(
+    partials, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, client: openai.AsyncOpenAI, model: str
+):
+    return await _complete(client, sem, limiter, model, _merge_messages(partials))
+
+
+def merge_fan_in(model: str) -> int:
+    """
+    Number of partial summaries one merge prompt can hold for `model`: each partial may be
+    up to MAX_COMPLETION_TOKENS long, so the fan-in shrinks with the context window.
+    """
+    return max(2, min(MERGE_FAN_IN, chunk_budget(model) // MAX_COMPLETION_TOKENS))
+
+
+def _merge_groups(partials, k: int):
+    # Split into the fewest groups of at most `k`, with sizes differing by at most one,
+    # so no group is a lone partial re-summarized on its own
+    n = len(partials)
+    n_groups = math.ceil(n / k)
+    return [partials[i * n // n_groups:(i + 1) * n // n_groups] for i in range(n_groups)]
+
+
+async def _reduce(
+    partials, sem: asyncio.Semaphore, limiter: aiolimiter.AsyncLimiter, client: openai.AsyncOpenAI, model: str,
+    k: int = None
+):
+    """
+    Tree-reduces partial summaries: each round merges evenly sized groups of at most
+    `k` (default: merge_fan_in(model)) concurrently, until at most `k` remain for the
+    final (streamed) merge. No merge prompt holds more than `k` partials regardless of
+    video length.
+    """
+    if k is None:
+        k = merge_fan_in(model)
+    while len(partials) > k:
+        groups = _merge_groups(partials, k)
+        partials = await asyncio.gather(
+            *[_merge_partials_async(g, sem, limiter, client=client, model=model) for g in groups]
         )
+    return list(partials)
 
-        resp = openai.ChatCompletion.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.2,
+
+def _summary_semaphore():
+    # Caps in-flight OpenAI requests for one run (CCORE_SUMMARY_CONCURRENCY, default 3)
+    return asyncio.Semaphore(int(os.getenv("CCORE_SUMMARY_CONCURRENCY", 3)))
+
+
+async def _stream_summary(transcript, client, model, max_tokens, overlap, window_seconds, sem, limiter):
+    # Identical transcript + settings + prompts -> identical summary, so skip the LLM entirely
+    key = _cache_key(
+        "summary", transcript.to_dict(), model, max_tokens, overlap, window_seconds, TARGET_SUMMARY_TOKENS, _PROMPT_HASH
+    )
+    cached = _cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    # 1) Merge caption cues into windows
+    merged = merge_transcript_entries(transcript, window_seconds)
+
+    # 2) Format and chunk by token budget in one pass
+    chunks = list(chunk_transcript(merged, model, max_tokens=max_tokens, overlap=overlap))
+    if not chunks:
+        raise ValueError("Transcript has no captions to summarize")
+
+    total_tokens = sum(n for _, n in chunks)
+    if len(chunks) == 1:
+        # A single chunk needs no merge: stream its summary directly
+        ch, n = chunks[0]
+        budget = chunk_summary_budget(n, total_tokens)
+        deltas = _stream_completion(client, sem, limiter, model, _chunk_messages(ch, budget), max_tokens=budget)
+    else:
+        # 3) Map: summarize all chunks concurrently (network-bound, so wall time ~ slowest call),
+        #    each with a completion budget proportional to its share of the transcript
+        partial_summaries = await asyncio.gather(
+            *[
+                _summarize_chunk_async(
+                    ch, sem, limiter, client=client, model=model,
+                    max_tokens=chunk_summary_budget(n, total_tokens)
+                )
+                for ch, n in chunks
+            ]
         )
-        return resp.choices[0].message.content.strip()
+
+        # 4) Reduce: merge partials level by level, streaming the last merge
+        partial_summaries = await _reduce(partial_summaries, sem, limiter, client=client, model=model)
+        deltas = _stream_completion(client, sem, limiter, model, _merge_messages(partial_summaries))
+
+    buf = io.StringIO()
+    async for delta in deltas:
+        buf.write(delta)
+        yield delta
+    _cache.set(key, buf.getvalue().strip())
+
+
+async def stream_summary_chunked(
+    transcript, openai_api_key, model="gpt-3.5-turbo", max_tokens=None, overlap=200, window_seconds=WINDOW_SECONDS,
+    client=None
+):
+    """
+    Async generator version of summarize_with_chatgpt_chunked: the final merge is
+    yielded piece by piece as the model produces it.
+    :param client: Optional openai.AsyncOpenAI client to use (and leave open) instead of one built from the key.
+    """
+    try:
+        # Share one client (and its connection pool) across every request of this run
+        async with _client_scope(openai_api_key, client) as client:
+            async for delta in _stream_summary(
+                transcript, client, model, max_tokens, overlap, window_seconds, _summary_semaphore(), _rate_limiter()
+            ):
+                yield delta
     except Exception as e:
+        yield f"Error during summarization (chunked): {e}"
+
+
+async def summarize_videos(
+    video_urls, openai_api_key, model="gpt-3.5-turbo", max_tokens=None, overlap=200, window_seconds=WINDOW_SECONDS,
+    client=None
+):
+    """
+    Fetches and summarizes several videos concurrently. All videos share one OpenAI
+    client, one request semaphore and one rate limiter, so CCORE_SUMMARY_CONCURRENCY and
+    CCORE_OPENAI_RPM bound the whole batch.
+    :param video_urls: URLs of the YouTube videos
+    :param client: Optional openai.AsyncOpenAI client to use (and leave open) instead of one built from the key.
+    :return: List of summaries (or error messages), in the order of `video_urls`
+    """
+    loop = asyncio.get_running_loop()
+    sem = _summary_semaphore()
+    limiter = _rate_limiter()
+
+    async def _one(video_url):
+        # The transcript client is blocking, so fetch in a worker thread
+        transcript = await loop.run_in_executor(None, fetch_transcript_with_timestamps, video_url)
+        if isinstance(transcript, str):
+            return transcript
+        try:
+            return await _collect(
+                _stream_summary(transcript, client, model, max_tokens, overlap, window_seconds, sem, limiter)
+            )
+        except Exception as e:
+            return f"Error during summarization (chunked): {e}"
+
+    async with _client_scope(openai_api_key, client) as client:
+        return list(await asyncio.gather(*[_one(url) for url in video_urls]))
+
+
+def summarize_with_chatgpt_chunked(
+    transcript, openai_api_key, model="gpt-3.5-turbo", max_tokens=None, overlap=200, window_seconds=WINDOW_SECONDS
+):
+    """
+    Map-reduce summarizer: chunks are summarized concurrently (at most
+    CCORE_SUMMARY_CONCURRENCY requests in flight, default 3), then merged.
+    :param max_tokens: Subtitle tokens per chunk (default: fill the model's context window).
+    :param overlap: Tokens shared between consecutive chunks.
+    :param window_seconds: Length of the windows caption cues are merged into.
+    """
+    summary = _collect(stream_summary_chunked(
+        transcript, openai_api_key, model=model, max_tokens=max_tokens, overlap=overlap,
+        window_seconds=window_seconds
+    ))
+    try:
+        return asyncio.run(summary)
+    except Exception as e:
+        # e.g. called from a running event loop; don't leave the coroutine un-awaited
+        summary.close()
         return f"Error during summarization (chunked): {e}"
 
 
+async def _print_stream(deltas):
+    async for delta in deltas:
+        print(delta, end="", flush=True)
+    print()
+
+
 if __name__ == "__main__":
     video_url = input("Enter the YouTube video URL: ")      # Input the video URL
     openai_api_key = input("Enter your OpenAI API key: ")   # Input OpenAI API key
@@ -180,17 +634,12 @@ if __name__ == "__main__":
         print(transcript)
     else:
         print("\nSubtitles with Timestamps:")
-        for entry in transcript:
-            start_time = format_timestamp(entry["start_time"])
-            end_time = format_timestamp(entry["end_time"])
-            text = entry["text"]
-            print(f"[{start_time} - {end_time}] {text}")
+        # One write for the whole transcript instead of a print (and lock/flush) per line
+        sys.stdout.write(format_subtitles(transcript) + "\n")
 
         print("\nSummary with Timestamps:")
-        summary = summarize_with_chatgpt_chunked(
+        asyncio.run(_print_stream(stream_summary_chunked(
             transcript,
             openai_api_key,
-            model="gpt-3.5-turbo",
-            max_chars=6000
-        )
-        print(summary)
+            model="gpt-3.5-turbo"
+        )))
@@ -0,0 +1,106 @@
+from array import array
+
+import pytest
+
+import summarizer
+
+
+def _transcript(cues):
+    return summarizer.Transcript(
+        array("d", [c[0] for c in cues]), array("d", [c[1] for c in cues]), [c[2] for c in cues]
+    )
+
+
+def _windows(transcript):
+    return list(zip(transcript.starts, transcript.ends, transcript.texts))
+
+
+def test_merge_transcript_entries_overlapping_cues():
+    # Durations run past the next cue's start, so `ends` is not sorted
+    cues = [(0, 5, "a"), (3, 12, "b"), (10, 25, "c"), (14, 18, "d"), (22, 30, "e"), (28, 47, "f"), (31, 35, "g")]
+
+    merged = summarizer.merge_transcript_entries(_transcript(cues), window_seconds=20)
+
+    assert _windows(merged) == [(0, 12, "a b"), (10, 25, "c d"), (22, 30, "e"), (28, 47, "f g")]
+
+
+def test_merge_transcript_entries_empty():
+    assert len(summarizer.merge_transcript_entries(_transcript([]))) == 0
+
+
+class _WordEncoder:
+    # Stand-in tokenizer: one token per space-separated word
+    def encode(self, text):
+        return text.split(" ")
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(summarizer, "_ENC", lambda model: _WordEncoder())
+
+
+def _cue_transcript(texts):
+    return _transcript([(20 * i, 20 * i + 20, text) for i, text in enumerate(texts)])
+
+
+def test_chunk_transcript_respects_max_tokens(word_tokens):
+    transcript = _cue_transcript(["w " * (i % 7) + "end" for i in range(50)])
+
+    chunks = list(summarizer.chunk_transcript(transcript, "m", max_tokens=30, overlap=10))
+
+    assert len(chunks) > 1
+    assert all(n <= 30 for _, n in chunks)
+
+
+def test_chunk_transcript_splits_oversize_line(word_tokens):
+    long_text = " ".join("w%d" % i for i in range(100))
+    transcript = _cue_transcript(["short", long_text, "tail"])
+
+    chunks = list(summarizer.chunk_transcript(transcript, "m", max_tokens=20, overlap=0))
+
+    assert all(n <= 20 for _, n in chunks)
+    text = " ".join(c for c, _ in chunks)
+    assert all("w%d" % i in text.split() for i in range(100))
+
+
+def test_chunk_transcript_overlap_is_bounded(word_tokens):
+    transcript = _cue_transcript(["x%d y z" % i for i in range(40)])
+    overlap = 15
+
+    chunks = [c.split("\n") for c, _ in summarizer.chunk_transcript(transcript, "m", max_tokens=40, overlap=overlap)]
+
+    assert len(chunks) > 1
+    for prev, cur in zip(chunks, chunks[1:]):
+        shared = [line for line in cur if line in prev]
+        assert shared == prev[len(prev) - len(shared):]
+        assert sum(len(line.split(" ")) + 1 for line in shared) <= overlap
+
+
+@pytest.mark.parametrize("max_tokens, overlap", [(1, 0), (10, 10), (10, -1)])
+def test_chunk_transcript_rejects_bad_budgets(word_tokens, max_tokens, overlap):
+    with pytest.raises(ValueError):
+        list(summarizer.chunk_transcript(_cue_transcript(["a"]), "m", max_tokens=max_tokens, overlap=overlap))
+
+
+def test_merge_groups_are_even():
+    assert [len(g) for g in summarizer._merge_groups(list(range(9)), 8)] == [4, 5]
+    assert [len(g) for g in summarizer._merge_groups(list(range(57)), 8)] == [7, 7, 7, 7, 7, 7, 7, 8]
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?list=PL123&v=dQw4w9WgXcQ&t=42",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube.com/live/dQw4w9WgXcQ?feature=share",
+])
+def test_vid_re_extracts_id(url):
+    assert summarizer._VID_RE.search(url).group(1) == "dQw4w9WgXcQ"
+
+
+def test_vid_re_ignores_v_inside_other_parameters():
+    assert summarizer._VID_RE.search("https://www.youtube.com/watch?list=PL&av=abcdefghijkXYZ") is None